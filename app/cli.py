@@ -1,6 +1,9 @@
 import argparse
+import csv
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -8,14 +11,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.pdf_extractor import PDFExtractor
 from src.field_mapper import FieldMapper
 from src.amendment_parser import AmendmentParser
-from src.pdf_generator import PDFGenerator
+from src.pdf_generator import get_generator
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 def process_charter_party(template_path: str, recap_path: str, 
-                         output_path: str, verbose: bool = False) -> bool:
+                         output_path: str, verbose: bool = False,
+                         concurrent_extraction: bool = True) -> bool:
     """Process charter party PDFs"""
     try:
         logger.info("=" * 60)
@@ -37,9 +41,17 @@ def process_charter_party(template_path: str, recap_path: str,
         
         # Extract
         logger.info("\n[1/4] Extracting PDF content...")
-        extractor = PDFExtractor()
-        template_data = extractor.extract_template(str(template_file))
-        recap_data = extractor.extract_recap(str(recap_file))
+        if concurrent_extraction:
+            # PyMuPDF is not thread-safe, so each document gets its own process
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                template_future = executor.submit(PDFExtractor().extract_template, str(template_file))
+                recap_future = executor.submit(PDFExtractor().extract_recap, str(recap_file))
+                template_data = template_future.result()
+                recap_data = recap_future.result()
+        else:
+            extractor = PDFExtractor()
+            template_data = extractor.extract_template(str(template_file))
+            recap_data = extractor.extract_recap(str(recap_file))
         logger.info("  ✓ PDFs extracted")
         
         # Map fields
@@ -52,14 +64,15 @@ def process_charter_party(template_path: str, recap_path: str,
         logger.info("\n[3/4] Detecting amendments...")
         parser = AmendmentParser()
         amendments = parser.detect_amendments(
-            template_data.get("part_ii", []),
-            recap_data.get("part_ii", [])
+            template_data["part_ii"],
+            recap_data["part_ii"]
         )
-        logger.info(f"  ✓ Deleted: {len(amendments['deleted'])}, Added: {len(amendments['added'])}")
+        logger.info(f"  ✓ Deleted: {len(amendments['deleted'])}, Added: {len(amendments['added'])}, "
+                    f"Modified: {len(amendments['modified'])}")
         
         # Generate PDF
         logger.info("\n[4/4] Generating final PDF...")
-        generator = PDFGenerator()
+        generator = get_generator()
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
@@ -85,24 +98,97 @@ def process_charter_party(template_path: str, recap_path: str,
         return False
 
 
+def process_batch(manifest_path: str, workers: Optional[int] = None,
+                  verbose: bool = False) -> bool:
+    """Process every template/recap pair listed in a CSV manifest.
+    
+    The manifest needs a header row with ``template``, ``recap`` and
+    ``output`` columns; relative paths are resolved against the manifest's
+    directory. Pairs are independent, so they run in separate processes.
+    """
+    manifest_file = Path(manifest_path)
+    if not manifest_file.exists():
+        logger.error(f"Manifest file not found: {manifest_path}")
+        return False
+    
+    columns = ("template", "recap", "output")
+    with open(manifest_file, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in columns if column not in (reader.fieldnames or [])]
+        if missing:
+            logger.error(f"Manifest {manifest_file.name} is missing column(s): {', '.join(missing)}")
+            return False
+        
+        jobs = []
+        for row in reader:
+            if not all(row[column] for column in columns):
+                logger.error(f"Manifest {manifest_file.name} line {reader.line_num}: "
+                             f"template, recap and output are all required")
+                return False
+            jobs.append(tuple(str(manifest_file.parent / row[column]) for column in columns))
+    
+    logger.info(f"Batch: {len(jobs)} template/recap pair(s) from {manifest_file.name}")
+    
+    # Jobs already run in parallel, so each one extracts its PDFs in-process
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(process_charter_party, template, recap, output, verbose, False)
+            for template, recap, output in jobs
+        ]
+        results = []
+        for future, (template, recap, output) in zip(futures, jobs):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # A crashed worker (e.g. BrokenProcessPool) fails its job, not the batch
+                logger.error(f"Batch job for {output} failed: {e}")
+                results.append(False)
+    
+    failures = [job for job, success in zip(jobs, results) if not success]
+    logger.info("=" * 60)
+    logger.info(f"Batch complete: {len(jobs) - len(failures)} succeeded, {len(failures)} failed")
+    for template, recap, output in failures:
+        logger.error(f"  ✗ {Path(template).name} + {Path(recap).name} -> {output}")
+    logger.info("=" * 60)
+    
+    return not failures
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Charter Party PDF Automation Tool"
     )
     
-    parser.add_argument("--template", type=str, help="Path to template PDF", required=True)
-    parser.add_argument("--recap", type=str, help="Path to recap PDF", required=True)
+    parser.add_argument("--template", type=str, help="Path to template PDF")
+    parser.add_argument("--recap", type=str, help="Path to recap PDF")
     parser.add_argument("-o", "--output", type=str, default="Final_Filled.pdf")
+    parser.add_argument("--batch", type=str,
+                        help="CSV manifest with template,recap,output columns")
+    parser.add_argument("--workers", type=positive_int, default=None,
+                        help="Worker processes for --batch (default: CPU count)")
     parser.add_argument("-v", "--verbose", action="store_true")
     
     args = parser.parse_args()
     
-    success = process_charter_party(
-        args.template,
-        args.recap,
-        args.output,
-        args.verbose
-    )
+    if args.batch:
+        success = process_batch(args.batch, args.workers, args.verbose)
+    elif args.template and args.recap:
+        success = process_charter_party(
+            args.template,
+            args.recap,
+            args.output,
+            args.verbose
+        )
+    else:
+        parser.error("--template and --recap are required unless --batch is given")
     
     sys.exit(0 if success else 1)
 
@@ -1,8 +1,12 @@
 import streamlit as st
+import pandas as pd
 import tempfile
 import os
 import sys
 import datetime
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import logging
 
@@ -14,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.pdf_extractor import PDFExtractor
 from src.field_mapper import FieldMapper
 from src.amendment_parser import AmendmentParser
-from src.pdf_generator import PDFGenerator
+from src.pdf_generator import get_generator
 
 
 def setup_page():
@@ -25,15 +29,82 @@ def setup_page():
         initial_sidebar_state="expanded"
     )
 
-# Add these helper functions at top after imports
+@st.cache_resource
+def get_extraction_executor():
+    # PyMuPDF is not thread-safe, so extraction runs in worker processes.
+    # This is called from a script thread while the server threads may hold
+    # locks, so the workers must not be forked from this process
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context(method))
 
-def safe_get_part_ii(data):
-    if data and isinstance(data, dict):
-        result = data.get("part_ii")
-        if result is None:
-            return []
-        return result
-    return []
+def start_extraction(kind, uploaded_file):
+    """Start extracting an upload in the background, once per file content.
+    
+    Every rerun hands back the uploaded file again, so the content hash is
+    kept in session state and an unchanged file is not parsed twice, even
+    if it is removed and uploaded again. A file that failed is retried only
+    when it is uploaded again, not on every rerun that still holds it.
+    """
+    upload_id = getattr(uploaded_file, "file_id", None)
+    if (st.session_state.get(f"{kind}_error")
+            and st.session_state.get(f"{kind}_upload_id") == upload_id):
+        return
+    
+    data = uploaded_file.getvalue()
+    file_hash = hashlib.blake2b(data, digest_size=8).digest()
+    if st.session_state.get(f"{kind}_hash") == file_hash:
+        return
+    
+    extractor = PDFExtractor()
+    extract = extractor.extract_template_bytes if kind == "template" else extractor.extract_recap_bytes
+    st.session_state[f"{kind}_hash"] = file_hash
+    st.session_state[f"{kind}_upload_id"] = upload_id
+    st.session_state[f"{kind}_data"] = None
+    st.session_state[f"{kind}_error"] = None
+    st.session_state[f"{kind}_future"] = get_extraction_executor().submit(extract, data)
+
+def extraction_pending(kind):
+    future = st.session_state.get(f"{kind}_future")
+    return future is not None and not future.done()
+
+def collect_extraction(kind):
+    """Move a finished background extraction into session state"""
+    future = st.session_state.get(f"{kind}_future")
+    if future is None or not future.done():
+        return
+    
+    st.session_state[f"{kind}_future"] = None
+    try:
+        st.session_state[f"{kind}_data"] = future.result()
+    except Exception as e:
+        st.session_state[f"{kind}_error"] = str(e)
+        # Forget the content hash so uploading the same file again retries
+        # (see start_extraction)
+        st.session_state[f"{kind}_hash"] = None
+
+@st.fragment(run_every=0.5)
+def poll_extractions():
+    """Rerun the whole app once the running extractions have finished"""
+    pending = [kind for kind in ("template", "recap") if extraction_pending(kind)]
+    if pending:
+        st.info(f"⏳ Extracting {' and '.join(pending)}...")
+    else:
+        st.rerun()
+
+def show_extraction_status(kind, label):
+    collect_extraction(kind)
+    if st.session_state.get(f"{kind}_error"):
+        st.error(f"Error: {st.session_state[f'{kind}_error']}")
+    elif st.session_state.get(f"{kind}_data"):
+        st.info(f"{label}: {st.session_state[f'{kind}_data']['pages']} page(s)")
+
+@st.cache_data(show_spinner=False)
+def map_part_i_fields(recap_data):
+    return FieldMapper().extract_part_i_fields(recap_data)
+
+@st.cache_data(show_spinner=False)
+def detect_amendments(template_part_ii, recap_part_ii):
+    return AmendmentParser().detect_amendments(template_part_ii, recap_part_ii)
 
 def debug_session_state():
     st.write("DEBUG: Session State Keys", list(st.session_state.keys()))
@@ -77,20 +148,8 @@ def main():
             
             if template_file:
                 st.success("✅ Template uploaded")
-                with st.spinner("Extracting template..."):
-                    try:
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                            tmp.write(template_file.read())
-                            tmp_path = tmp.name
-                        
-                        extractor = PDFExtractor()
-                        st.session_state.template_data = extractor.extract_template(tmp_path)
-                        os.unlink(tmp_path)
-                        
-                        st.info(f"Template: {st.session_state.template_data['pages']} page(s)")
-                    
-                    except Exception as e:
-                        st.error(f"Error: {str(e)}")
+                start_extraction("template", template_file)
+            show_extraction_status("template", "Template")
         
         with col2:
             st.subheader("Recap PDF")
@@ -102,20 +161,13 @@ def main():
             
             if recap_file:
                 st.success("✅ Recap uploaded")
-                with st.spinner("Extracting recap..."):
-                    try:
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                            tmp.write(recap_file.read())
-                            tmp_path = tmp.name
-                        
-                        extractor = PDFExtractor()
-                        st.session_state.recap_data = extractor.extract_recap(tmp_path)
-                        os.unlink(tmp_path)
-                        
-                        st.info(f"Recap: {st.session_state.recap_data['pages']} page(s)")
-                    
-                    except Exception as e:
-                        st.error(f"Error: {str(e)}")
+                start_extraction("recap", recap_file)
+            show_extraction_status("recap", "Recap")
+        
+        # Extraction runs in the background so the page stays responsive;
+        # poll until it is done, then rerun to fill in the preview
+        if st.session_state.get("template_future") or st.session_state.get("recap_future"):
+            poll_extractions()
     
     # TAB 2: PREVIEW
     with tab2:
@@ -124,33 +176,26 @@ def main():
         if st.session_state.template_data and st.session_state.recap_data:
             
             with st.expander("📋 Part I - Commercial Terms", expanded=True):
-                mapper = FieldMapper()
-                fields = mapper.extract_part_i_fields(st.session_state.recap_data)
+                fields = map_part_i_fields(st.session_state.recap_data)
                 
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.write("**Field #**")
-                    for i in range(1, 20):
-                        st.write(f"{i}")
-                with col2:
-                    st.write("**Label**")
-                    for i in range(1, 20):
-                        label = mapper.FIELD_LABELS.get(i, "")
-                        st.write(label[:30])
-                with col3:
-                    st.write("**Value**")
-                    for i in range(1, 20):
-                        value = fields.get(i, {}).get("value", "")
-                        st.write(value[:30] if value else "—")
+                rows = [
+                    (
+                        i,
+                        FieldMapper.FIELD_LABELS.get(i, "")[:30],
+                        (fields.get(i) or {}).get("value", "")[:30] or "—"
+                    )
+                    for i in range(1, 20)
+                ]
+                st.dataframe(
+                    pd.DataFrame(rows, columns=["Field #", "Label", "Value"]),
+                    width="stretch",
+                    hide_index=True
+                )
             
             with st.expander("🔄 Amendment Analysis", expanded=True):
-                parser = AmendmentParser()
-                template_part_ii = safe_get_part_ii(st.session_state.template_data)
-                recap_part_ii = safe_get_part_ii(st.session_state.recap_data)
-
-                amendments = parser.detect_amendments(
-                    template_part_ii,
-                    recap_part_ii
+                amendments = detect_amendments(
+                    st.session_state.template_data["part_ii"],
+                    st.session_state.recap_data["part_ii"]
                 )
                 st.session_state.amendments = amendments
                 
@@ -176,22 +221,17 @@ def main():
             if st.button("🚀 Generate Final PDF", use_container_width=True):
                 with st.spinner("Generating PDF..."):
                     try:
-                        mapper = FieldMapper()
-                        fields = mapper.extract_part_i_fields(st.session_state.recap_data)
+                        fields = map_part_i_fields(st.session_state.recap_data)
                         
-                        parser = AmendmentParser()
-                        template_part_ii = safe_get_part_ii(st.session_state.template_data)
-                        recap_part_ii = safe_get_part_ii(st.session_state.recap_data)
-
-                        amendments = parser.detect_amendments(
-                            template_part_ii,
-                            recap_part_ii
+                        amendments = detect_amendments(
+                            st.session_state.template_data["part_ii"],
+                            st.session_state.recap_data["part_ii"]
                         )
                         
                         with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
                             output_path = tmp.name
                         
-                        generator = PDFGenerator()
+                        generator = get_generator()
                         print("Part I Fields sent to PDF Generator:")
                         for k, v in fields.items():
                             print(f"{k}: {v.get('label')} = {v.get('value')}")
@@ -1,10 +1,25 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from difflib import SequenceMatcher
+from itertools import zip_longest
 import logging
 
+from xxhash import xxh3_64_intdigest
+
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _normalize(text: str) -> str:
+    """Normalize a line for comparison: case and whitespace are ignored"""
+    return _WHITESPACE_RE.sub(' ', text.strip().lower())
+
+
+def _line_hash(text: str) -> int:
+    """64-bit hash of the normalized line, used as its identity in the diff"""
+    return xxh3_64_intdigest(_normalize(text).encode())
+
 
 class AmendmentParser:
     """Parses and detects amendments between template and recap clauses"""
@@ -32,10 +47,10 @@ class AmendmentParser:
             recap_lines = self._extract_clause_lines(recap_clauses)
             
             amendments = self._analyze_diff(template_lines, recap_lines)
-            amendments["new"] = self._find_new_lines(template_clauses, recap_clauses)
             
             logger.info(f"Amendments detected: {len(amendments['deleted'])} deleted, "
-                       f"{len(amendments['added'])} added, {len(amendments['new'])} new")
+                       f"{len(amendments['added'])} added, {len(amendments['new'])} new, "
+                       f"{len(amendments['modified'])} modified")
             
             return amendments
         except Exception as e:
@@ -48,10 +63,12 @@ class AmendmentParser:
         for clause in clauses:
             if "content" in clause:
                 for item in clause["content"]:
+                    text = item.get("text", "")
                     lines.append({
                         "line": item.get("line"),
-                        "text": item.get("text", ""),
-                        "original": item.get("original", True),
+                        "text": text,
+                        "hash": _line_hash(text),
+                        "original": item.get("original"),
                         "clause_title": clause.get("title", "")
                     })
         return lines
@@ -62,55 +79,92 @@ class AmendmentParser:
         amendments = {
             "deleted": [],
             "added": [],
+            "new": [],
             "modified": []
         }
         
-        template_texts = {item["text"]: item for item in template_lines}
-        recap_texts = {item["text"]: item for item in recap_lines}
-        
-        # Find deleted text
-        for text, item in template_texts.items():
-            if text not in recap_texts:
-                amendments["deleted"].append({
+        # Lines are compared by their precomputed hashes; the texts are only
+        # normalized again for the few replaced pairs that need a ratio
+        template_hashes = [item["hash"] for item in template_lines]
+        recap_hashes = []
+        for item in recap_lines:
+            recap_hashes.append(item["hash"])
+            
+            # Unnumbered lines not flagged as original were inserted in the recap
+            if not item["original"] and not item["line"]:
+                amendments["new"].append({
                     "text": item["text"],
-                    "line": item.get("line"),
-                    "clause": item.get("clause_title")
+                    "clause": item["clause_title"],
+                    "position": "after_clause"
                 })
+        matcher = SequenceMatcher(None, template_hashes, recap_hashes, autojunk=False)
         
-        # Find added text
-        for text, item in recap_texts.items():
-            if text not in template_texts and not item.get("original", False):
-                amendments["added"].append({
-                    "text": text,
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            
+            deleted = list(range(i1, i2))
+            added = list(range(j1, j2))
+            
+            # Pair replaced lines in order; close enough pairs are edits of
+            # the same line rather than a deletion plus an addition
+            if tag == "replace":
+                deleted, added = [], []
+                for i, j in zip_longest(range(i1, i2), range(j1, j2)):
+                    if i is None:
+                        added.append(j)
+                    elif j is None:
+                        deleted.append(i)
+                    else:
+                        similarity = self._similarity(
+                            _normalize(template_lines[i]["text"]),
+                            _normalize(recap_lines[j]["text"])
+                        )
+                        if similarity is None:
+                            deleted.append(i)
+                            added.append(j)
+                        else:
+                            amendments["modified"].append({
+                                "text": recap_lines[j]["text"],
+                                "original_text": template_lines[i]["text"],
+                                "line": recap_lines[j].get("line"),
+                                "clause": recap_lines[j].get("clause_title"),
+                                "similarity": similarity
+                            })
+            
+            for i in deleted:
+                item = template_lines[i]
+                amendments["deleted"].append({
+                    "text": item["text"],
                     "line": item.get("line"),
                     "clause": item.get("clause_title")
                 })
+            
+            for j in added:
+                item = recap_lines[j]
+                if item["original"] is False:
+                    amendments["added"].append({
+                        "text": item["text"],
+                        "line": item.get("line"),
+                        "clause": item.get("clause_title")
+                    })
         
         return amendments
     
-    def _find_new_lines(self, template_clauses: List[Dict], 
-                        recap_clauses: List[Dict]) -> List[Dict]:
-        """Find new lines that don't exist in template"""
-        new_lines = []
+    def _similarity(self, a: str, b: str) -> Optional[float]:
+        """Return the similarity ratio of two lines, or None if below threshold.
         
-        template_lines = set()
-        for clause in template_clauses:
-            if "content" in clause:
-                for item in clause["content"]:
-                    if item.get("line"):
-                        template_lines.add(item["line"])
-        
-        for clause in recap_clauses:
-            if "content" in clause:
-                for item in clause["content"]:
-                    if not item.get("original", False) and not item.get("line"):
-                        new_lines.append({
-                            "text": item.get("text", ""),
-                            "clause": clause.get("title", ""),
-                            "position": "after_clause"
-                        })
-        
-        return new_lines
+        The cheap upper bounds are checked first; real_quick_ratio() only
+        looks at the lengths, so lines of very different size never reach
+        the full ratio() computation.
+        """
+        matcher = SequenceMatcher(None, a, b, autojunk=False)
+        threshold = self.similarity_threshold
+        if (matcher.real_quick_ratio() < threshold
+                or matcher.quick_ratio() < threshold):
+            return None
+        ratio = matcher.ratio()
+        return ratio if ratio >= threshold else None
     
     def format_amendments_for_display(self, amendments: Dict) -> str:
         """Format amendments as readable text for preview"""
@@ -121,6 +175,11 @@ class AmendmentParser:
             for item in amendments["deleted"]:
                 result.append(f"  Line {item.get('line', 'N/A')}: ~~{item['text']}~~")
         
+        if amendments.get("modified"):
+            result.append("\nMODIFIED TEXT:")
+            for item in amendments["modified"]:
+                result.append(f"  Line {item.get('line', 'N/A')}: ~~{item['original_text']}~~ -> {item['text']}")
+        
         if amendments.get("added"):
             result.append("\nADDED TEXT:")
             for item in amendments["added"]:
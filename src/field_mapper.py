@@ -31,9 +31,9 @@ class FieldMapper:
     }
     
     FIELD_VALIDATORS = {
-        1: r"^(VOY\d+|BALTIME|NYPE|GENCON).*",
-        2: r"^(MV|MS|MT|SS)\s+\w+",
-        3: r"^\w+\s*/\s*\w+",
+        1: re.compile(r"^(VOY\d+|BALTIME|NYPE|GENCON).*", re.IGNORECASE),
+        2: re.compile(r"^(MV|MS|MT|SS)\s+\w+", re.IGNORECASE),
+        3: re.compile(r"^\w+\s*/\s*\w+", re.IGNORECASE),
     }
     
     def __init__(self):
@@ -42,24 +42,19 @@ class FieldMapper:
     
     def extract_part_i_fields(self, recap_data: Dict) -> Dict:
         """Extract Part I fields from recap PDF data"""
-        fields = {}
         part_i_data = recap_data.get("part_i", {})
+        if not isinstance(part_i_data, dict):
+            return {}
         
-        if isinstance(part_i_data, dict):
-            for field_num in range(1, 20):
-                if field_num in part_i_data:
-                    fields[field_num] = {
-                        "label": self.FIELD_LABELS.get(field_num, ""),
-                        "value": part_i_data[field_num].get("value", ""),
-                        "original_label": part_i_data[field_num].get("label", "")
-                    }
-                else:
-                    fields[field_num] = {
-                        "label": self.FIELD_LABELS.get(field_num, ""),
-                        "value": ""
-                    }
-        
-        return fields
+        labels = self.FIELD_LABELS
+        return {
+            field_num: {
+                "label": labels.get(field_num, ""),
+                "value": (part_i_data.get(field_num) or {}).get("value", ""),
+                "original_label": (part_i_data.get(field_num) or {}).get("label", "")
+            }
+            for field_num in range(1, 20)
+        }
     
     def validate_fields(self, fields: Dict) -> Tuple[bool, Dict]:
         """Validate extracted field values"""
@@ -73,7 +68,7 @@ class FieldMapper:
         for field_num, validator in self.FIELD_VALIDATORS.items():
             if field_num in fields and fields[field_num].get("value"):
                 value = fields[field_num]["value"]
-                if not re.match(validator, value, re.IGNORECASE):
+                if not validator.match(value):
                     errors[field_num] = f"Field {field_num} format invalid: {value}"
         
         is_valid = len(errors) == 0
@@ -90,7 +85,7 @@ class FieldMapper:
                 value += " MT"
         
         elif field_num == 13:
-            value = value.replace("USD", "USD").replace("$", "USD ")
+            value = value.replace("$", "USD ")
         
         elif field_num == 15:
             value = value.upper()
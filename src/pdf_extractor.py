@@ -1,11 +1,20 @@
 import fitz
+import multiprocessing
+import os
 import re
-from typing import Dict, List, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+_FIELD_HEADER_MULTI_RE = re.compile(r'^(\d+)\.[^\S\n]+(.+?)(?:[^\S\n]+\(|$)', re.MULTILINE)
+_FIELD_HEADER_LOOSE_RE = re.compile(r'^(\d+)\.\s+(.+?)$')
+_CLAUSE_HEADER_RE = re.compile(r'^Clause\s*(\d+)\.\s*(.+)$')
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)\s+(.+)$')
+
 
 @dataclass
 class TextBlock:
@@ -18,203 +27,324 @@ class TextBlock:
     page: int
 
 
+def _page_text(page, backend: str) -> str:
+    """Return the text of a PyMuPDF page"""
+    if backend != "pymupdf-blocks":
+        return page.get_text()
+
+    # Text blocks sorted top-to-bottom, left-to-right give reading order even
+    # when the content stream was written out of order
+    blocks = [
+        TextBlock(text, x0, y0, x1, y1, page.number)
+        for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks")
+        if block_type == 0
+    ]
+    blocks.sort(key=lambda block: (block.y0, block.x0))
+    return "".join(block.text.rstrip('\n') + '\n' for block in blocks)
+
+
+def _iter_pdfium_page_texts(source, start: int, stop: int):
+    """Yield the text of pages [start, stop) using pypdfium2"""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError as e:
+        raise ImportError("The pypdfium2 backend requires: pip install pypdfium2") from e
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        for page_idx in range(start, stop):
+            page = pdf[page_idx]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+            # Unlike PyMuPDF, pdfium does not terminate the last line of a page.
+            # The page is closed before yielding, so stopping early leaks nothing
+            yield text.replace('\r\n', '\n') + '\n'
+    finally:
+        pdf.close()
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int,
+                        backend: str = "pymupdf") -> List[str]:
+    """Extract the text of pages [start, stop) in a worker process"""
+    if backend == "pypdfium2":
+        return list(_iter_pdfium_page_texts(pdf_path, start, stop))
+    with fitz.open(pdf_path) as doc:
+        return [_page_text(doc.load_page(page_idx), backend) for page_idx in range(start, stop)]
+
+
 class PDFExtractor:
     """Extracts text and structure from charter party PDFs"""
     
-    def __init__(self, enable_ocr: bool = False):
+    BACKENDS = ("pymupdf", "pymupdf-blocks", "pypdfium2")
+    
+    # Below this many pages the worker start-up cost outweighs the gain
+    PARALLEL_PAGE_THRESHOLD = 64
+    PAGES_PER_TASK = 8
+    
+    def __init__(self, enable_ocr: bool = False, max_workers: Optional[int] = None,
+                 backend: str = "pymupdf", executor: Optional[Executor] = None):
+        """Large documents are split into page ranges extracted in parallel.
+
+        ``executor`` is a process pool owned by the caller to run those
+        ranges on; without one, each extraction starts its own pool of at
+        most ``max_workers`` processes. Left as None, the limit is chosen
+        when a document is extracted, in the process doing the work: inside
+        a worker process (a batch job or a background extraction) it is 1,
+        so pages are read in-process instead of starting a nested pool.
+        Extractors are often built in a parent and sent to a pool, so this
+        cannot be decided here.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {self.BACKENDS}")
         self.enable_ocr = enable_ocr
+        self.max_workers = max_workers
+        self.executor = executor
+        self.backend = backend
         
+    # Every extract_* method returns a dict with the same keys: "part_i"
+    # (always a dict of field number -> field), "part_ii" (always a list of
+    # clauses), "pages" and "metadata" (always a dict), so callers can index
+    # the result directly.
+
     def extract_template(self, pdf_path: str) -> Dict:
         """Extract structure from template PDF"""
-        try:
-            doc = fitz.open(pdf_path)
-            result = {
-                "part_i": self._extract_part_i_template(doc),
-                "part_ii": self._extract_part_ii_template(doc),
-                "pages": doc.page_count,
-                "metadata": doc.metadata
-            }
-            doc.close()
-            return result
-        except Exception as e:
-            logger.error(f"Error extracting template: {e}")
-            raise
+        return self._extract(pdf_path, filled=False)
+    
+    def extract_template_bytes(self, data: bytes) -> Dict:
+        """Extract structure from template PDF content held in memory"""
+        return self._extract(data, filled=False)
     
     def extract_recap(self, pdf_path: str) -> Dict:
         """Extract data from recap PDF"""
+        return self._extract(pdf_path, filled=True)
+    
+    def extract_recap_bytes(self, data: bytes) -> Dict:
+        """Extract data from recap PDF content held in memory"""
+        return self._extract(data, filled=True)
+    
+    def _open(self, source):
+        """Open a PDF from a file path or from its raw bytes"""
+        if isinstance(source, (bytes, bytearray)):
+            return fitz.open(stream=source, filetype="pdf")
+        return fitz.open(source)
+    
+    def _extract(self, source, filled: bool) -> Dict:
+        own_executor = None
         try:
-            doc = fitz.open(pdf_path)
+            doc = self._open(source)
+            executor = None
+            if self._extract_in_parallel(doc):
+                # One pool per document, shared by both passes over the pages
+                executor = self.executor
+                if executor is None:
+                    task_count = -(-doc.page_count // self.PAGES_PER_TASK)
+                    executor = own_executor = ProcessPoolExecutor(
+                        max_workers=min(self._worker_limit(), task_count))
+            part_i, part_ii = self._extract_parts(doc, filled, executor)
             result = {
-                "part_i": self._extract_part_i_filled(doc),
-                "part_ii": self._extract_part_ii_filled(doc),
+                "part_i": part_i,
+                "part_ii": part_ii,
                 "pages": doc.page_count,
-                "metadata": doc.metadata
+                "metadata": doc.metadata or {}
             }
             doc.close()
             return result
         except Exception as e:
-            logger.error(f"Error extracting recap: {e}")
+            logger.error(f"Error extracting {'recap' if filled else 'template'}: {e}")
             raise
+        finally:
+            if own_executor is not None:
+                own_executor.shutdown(cancel_futures=True)
     
-    def _extract_part_i_template(self, doc) -> Dict:
-        """Extract Part I template structure"""
-        part_i = {}
-        full_text = ""
-        
-        for page in doc:
-            full_text += page.get_text()
-        
-        lines = full_text.split('\n')
-        for i, line in enumerate(lines):
-            match = re.match(r'^(\d+)\.\s+(.+?)(?:\s+\(|$)', line)
-            if match:
-                field_num = int(match.group(1))
-                field_label = match.group(2).strip()
-                if 1 <= field_num <= 19:
-                    part_i[field_num] = {
-                        "label": field_label,
-                        "value": "",
-                        "line_index": i
-                    }
-        
-        return part_i
-    
-    def _extract_part_i_filled(self, doc) -> Dict:
+    def _worker_limit(self) -> int:
+        """Processes an extraction may start, resolved in the current process"""
+        if self.max_workers is not None:
+            return self.max_workers
+        if multiprocessing.parent_process() is not None:
+            return 1
+        return min(8, os.cpu_count() or 1)
+
+    def _extract_in_parallel(self, doc) -> bool:
+        """Whether the pages of doc are worth extracting in worker processes"""
+        return (
+            (self.executor is not None or self._worker_limit() > 1)
+            and doc.page_count >= self.PARALLEL_PAGE_THRESHOLD
+            and bool(doc.name)
+        )
+
+    def _iter_page_texts(self, doc, executor: Optional[Executor] = None):
+        """Yield the raw text of each page, on executor's workers if given"""
+        if executor is not None:
+            yield from self._iter_page_texts_parallel(executor, doc.name, 0, doc.page_count)
+            return
+
+        if self.backend == "pypdfium2":
+            yield from _iter_pdfium_page_texts(doc.name or doc.tobytes(), 0, doc.page_count)
+            return
+
+        for page_idx in range(doc.page_count):
+            yield _page_text(doc.load_page(page_idx), self.backend)
+
+    def _iter_page_texts_parallel(self, executor: Executor, pdf_path: str,
+                                  start: int, stop: int):
+        """Yield page texts in order, extracting page ranges in worker processes.
+
+        PyMuPDF documents cannot be shared between threads, so each worker
+        opens the file itself and extracts a contiguous range of pages.
+        """
+        starts = range(start, stop, self.PAGES_PER_TASK)
+        stops = [min(range_start + self.PAGES_PER_TASK, stop) for range_start in starts]
+        results = executor.map(_extract_page_range, repeat(pdf_path),
+                               starts, stops, repeat(self.backend))
+        try:
+            for page_texts in results:
+                yield from page_texts
+        finally:
+            # Cancels the ranges not started yet when parsing stops early
+            results.close()
+
+    def _iter_text_blocks(self, page_texts):
+        """Yield runs of complete lines from a stream of page texts.
+
+        Only the trailing unterminated line of a page is carried over to the
+        next one, so at most one page is held in memory at a time.
+        """
+        # Fragments of the unterminated line, joined once it is complete
+        carry = []
+        for text in page_texts:
+            split_at = text.rfind('\n')
+            if split_at == -1:
+                carry.append(text)
+                continue
+            carry.append(text[:split_at])
+            yield "".join(carry)
+            carry = [text[split_at + 1:]]
+        yield "".join(carry)
+
+    def _extract_parts(self, doc, filled: bool,
+                       executor: Optional[Executor] = None) -> Tuple[Dict, List[Dict]]:
+        """Extract Part I fields and Part II clauses in one pass over the pages.
+
+        Part I runs up to the line holding the first "Part II" marker and
+        Part II from there to the next marker. Template fields only have a
+        label; recap fields also take the value lines below the label, up to
+        the next blank line or field. A document without a marker is
+        treated as all Part II.
+        """
         part_i = {}
-        full_text = ""
-
-        for page in doc:
-            full_text += page.get_text()
-
-        lines = full_text.split('\n')
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Stop extraction if reached Part II section
-            if "Part II" in line:
-                break
-
-            match = re.match(r'^(\d+)\.\s+(.+?)$', line)
-            if match:
-                field_num = int(match.group(1))
-                field_label = match.group(2).strip()
-
-                i += 1
-                value_lines = []
-                while i < len(lines) and lines[i].strip():
-                    next_line = lines[i].strip()
-                    if re.match(r'^\d+\.\s+', next_line) or "Part II" in next_line:
-                        i -= 1
+        field = None
+
+        def finish_field():
+            field_num, field_label, value_lines = field
+            if 1 <= field_num <= 19:
+                part_i[field_num] = {
+                    "label": field_label,
+                    "value": " ".join(value_lines).strip()
+                }
+
+        blocks = self._iter_text_blocks(self._iter_page_texts(doc, executor))
+        for block in blocks:
+            marker = block.find("Part II")
+            part_i_text = block if marker == -1 else block[:block.rfind('\n', 0, marker) + 1]
+
+            if len(part_i) == 19:
+                # Every field is known; the rest of Part I is only searched
+                # for the marker
+                part_i_text = ""
+
+            if not filled:
+                for match in _FIELD_HEADER_MULTI_RE.finditer(part_i_text):
+                    field_num = int(match.group(1))
+                    if 1 <= field_num <= 19:
+                        part_i[field_num] = {
+                            "label": match.group(2).strip(),
+                            "value": ""
+                        }
+            else:
+                for line in part_i_text.split('\n'):
+                    line = line.strip()
+                    match = _FIELD_HEADER_LOOSE_RE.match(line)
+                    if match:
+                        if field:
+                            finish_field()
+                        field = (int(match.group(1)), match.group(2).strip(), [])
+                    elif field:
+                        if line:
+                            field[2].append(line)
+                        else:
+                            # A blank line ends the value block
+                            finish_field()
+                            field = None
+
+                    if len(part_i) == 19:
+                        field = None
                         break
-                    value_lines.append(next_line)
-                    i += 1
 
-                if 1 <= field_num <= 19:
-                    part_i[field_num] = {
-                        "label": field_label,
-                        "value": " ".join(value_lines).strip(),
-                        "line_index": i
-                    }
+            if marker != -1:
+                if field:
+                    finish_field()
+                remainder = block[marker + len("Part II"):]
+                return part_i, self._parse_part_ii(chain([remainder], blocks))
 
-            i += 1
+        if field:
+            finish_field()
 
-        return part_i
+        return part_i, self._parse_part_ii(self._iter_text_blocks(self._iter_page_texts(doc, executor)))
 
-    def _extract_part_ii_template(self, doc) -> List[Dict]:
-        """Extract Part II clauses from template"""
+    def _parse_part_ii(self, blocks) -> List[Dict]:
+        """Parse Part II clauses from blocks of lines, stopping at a "Part II" marker"""
         clauses = []
-        full_text = ""
-        
-        for page in doc:
-            full_text += page.get_text()
-        
-        if "Part II" in full_text:
-            part_ii_text = full_text.split("Part II")[1]
-        else:
-            part_ii_text = full_text
-        
-        lines = part_ii_text.split('\n')
         current_clause = None
 
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-
-            # Match clause header like "Clause 1. Definitions"
-            clause_header_match = re.match(r'^Clause\s*(\d+)\.\s*(.+)$', stripped)
-            if clause_header_match:
-                current_clause = {
-                    "line": int(clause_header_match.group(1)),
-                    "title": stripped,
-                    "content": []
-                }
-                clauses.append(current_clause)
-                continue
+        for block in blocks:
+            for line in block.split('\n'):
+                marker = line.find("Part II")
+                if marker != -1:
+                    line = line[:marker]
 
-            # Match numbered lines like "1 Some clause text"
-            numbered_line_match = re.match(r'^(\d+)\s+(.+)$', stripped)
-            if numbered_line_match and current_clause is not None:
-                current_clause["content"].append({
-                    "line": int(numbered_line_match.group(1)),
-                    "text": numbered_line_match.group(2).strip()
-                })
-                continue
+                stripped = line.strip()
+                if stripped:
+                    current_clause = self._parse_part_ii_line(stripped, clauses, current_clause)
 
-            # Handle continuation or new lines without numbers
-            if current_clause is not None:
-                current_clause["content"].append({
-                    "line": None,
-                    "text": stripped
-                })
+                if marker != -1:
+                    return clauses
 
         return clauses
 
-        
-    def _extract_part_ii_filled(self, doc) -> List[Dict]:
-        """Extract Part II clauses from recap (with amendments)"""
-        clauses = []
-        full_text = ""
-        
-        for page in doc:
-            full_text += page.get_text()
-        
-        if "Part II" in full_text:
-            part_ii_text = full_text.split("Part II")[1]
+    def _parse_part_ii_line(self, stripped: str, clauses: List[Dict],
+                            current_clause: Optional[Dict]) -> Optional[Dict]:
+        """Add one non-blank Part II line to the clauses; return the open clause"""
+        # Match clause header like "Clause 1. Definitions"
+        clause_header_match = _CLAUSE_HEADER_RE.match(stripped)
+        if clause_header_match:
+            current_clause = {
+                "line": int(clause_header_match.group(1)),
+                "title": stripped,
+                "content": []
+            }
+            clauses.append(current_clause)
+            return current_clause
+
+        if current_clause is None:
+            return None
+
+        # Match numbered lines like "1 Some clause text"
+        numbered_line_match = _NUMBERED_LINE_RE.match(stripped)
+        if numbered_line_match:
+            current_clause["content"].append({
+                "line": int(numbered_line_match.group(1)),
+                "text": numbered_line_match.group(2).strip()
+            })
         else:
-            part_ii_text = full_text
-        
-        lines = part_ii_text.split('\n')
-        current_clause = None
-        
-        for line in lines:
-            # Match clause header like "Clause 1. Definitions"
-            clause_header_match = re.match(r'^Clause\s*(\d+)\.\s*(.+)$', line)
-            if clause_header_match:
-                current_clause = {
-                    "line": int(clause_header_match.group(1)),
-                    "title": line.strip(),
-                    "content": []
-                }
-                clauses.append(current_clause)
-                continue
-            
-            # Match numbered lines like "1 Some clause text"
-            numbered_line_match = re.match(r'^\s*(\d+)\s+(.+)$', line)
-            if numbered_line_match and current_clause is not None:
-                current_clause["content"].append({
-                    "line": int(numbered_line_match.group(1)),
-                    "text": numbered_line_match.group(2).strip()
-                })
-                continue
-            
             # Handle continuation or new lines without numbers
-            if current_clause and line.strip():
-                current_clause["content"].append({
-                    "line": None,
-                    "text": line.strip()
-                })
-        if clauses is None:
-            clauses = []
-        return clauses
+            current_clause["content"].append({
+                "line": None,
+                "text": stripped
+            })
+        return current_clause
@@ -0,0 +1,80 @@
+from reportlab.lib import colors
+from reportlab.platypus import Flowable
+from typing import List, Tuple
+
+from .pdf_layout import PART_I_CELL_PADDING, PART_I_FONT_SIZE, PART_I_ROW_PADDING
+
+
+class PartIGrid(Flowable):
+    """Part I rows drawn straight onto the canvas.
+
+    The grid has three fixed columns and almost every cell is one line, so
+    plain string cells are a setFont/drawString each instead of going
+    through Table layout. Cells holding a Paragraph (text too wide for its
+    column) are wrapped and drawn as usual. Splits between rows.
+    """
+
+    FONTS = ("Helvetica-Bold", "Helvetica-Bold", "Helvetica")
+    GRID_COLOR = colors.HexColor("#CCCCCC")
+
+    def __init__(self, rows: List[List], col_widths: Tuple[float, ...]):
+        super().__init__()
+        self.rows = rows
+        self.col_widths = col_widths
+        self._row_heights = None
+        self.hAlign = "CENTER"
+
+    def _row_height(self, row: List) -> float:
+        height = PART_I_FONT_SIZE * 1.2
+        for cell, col_width in zip(row, self.col_widths):
+            if not isinstance(cell, str):
+                _, cell_height = cell.wrap(col_width - 2 * PART_I_CELL_PADDING, 1e6)
+                height = max(height, cell_height)
+        return height + 2 * PART_I_ROW_PADDING
+
+    def wrap(self, availWidth, availHeight):
+        if self._row_heights is None:
+            self._row_heights = [self._row_height(row) for row in self.rows]
+        self.width = sum(self.col_widths)
+        self.height = sum(self._row_heights)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        self.wrap(availWidth, availHeight)
+        used = 0
+        for n, height in enumerate(self._row_heights):
+            used += height
+            if used > availHeight:
+                break
+        else:
+            return [self]
+        if n == 0:
+            return []
+        return [PartIGrid(self.rows[:n], self.col_widths),
+                PartIGrid(self.rows[n:], self.col_widths)]
+
+    def draw(self):
+        canv = self.canv
+        col_x = [0]
+        for col_width in self.col_widths:
+            col_x.append(col_x[-1] + col_width)
+
+        canv.saveState()
+        canv.setStrokeColor(self.GRID_COLOR)
+        canv.setLineWidth(0.5)
+        top = self.height
+        for row, height in zip(self.rows, self._row_heights):
+            cell_top = top - PART_I_ROW_PADDING
+            for cell, x, font in zip(row, col_x, self.FONTS):
+                if isinstance(cell, str):
+                    canv.setFont(font, PART_I_FONT_SIZE)
+                    canv.drawString(x + PART_I_CELL_PADDING,
+                                    cell_top - PART_I_FONT_SIZE, cell)
+                else:
+                    cell.drawOn(canv, x + PART_I_CELL_PADDING, cell_top - cell.height)
+            canv.line(0, top, self.width, top)
+            top -= height
+        canv.line(0, 0, self.width, 0)
+        for x in col_x:
+            canv.line(x, 0, x, self.height)
+        canv.restoreState()
@@ -1,16 +1,92 @@
+# Only the constant-only reportlab modules are imported here; platypus,
+# styles and font metrics are imported where they are used, so importing
+# this module (e.g. from the package __init__) does not load them
 from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from reportlab.lib.enums import TA_LEFT
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple
+import io
 import logging
+import multiprocessing
+import os
+import tempfile
+
+from .pdf_layout import PART_I_CELL_PADDING, PART_I_FONT_SIZE, PART_I_ROW_PADDING
 
 logger = logging.getLogger(__name__)
 
+# Bound str.format methods for the markup built once per line
+_BOLD_FMT = "<b>{}</b>".format
+_LINE_FMT = "<b>{:2d}</b>&nbsp;&nbsp;{}".format
+_DEL_FMT = "~~{}~~".format
+
+# Paragraph text is parsed as markup, so data must have these escaped
+_XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# The process umask, read once at import (os.umask can only be read by
+# setting it, which is not thread-safe later on)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Shared stand-in for a missing field entry; never mutated
+_EMPTY = {}
+
+
+def _write_atomic(output_path: str, data: bytes) -> None:
+    """Write data to output_path, replacing the file atomically.
+
+    The bytes go to a uniquely named temporary file in the same directory,
+    which is flushed to disk and then renamed over the target, so readers
+    and concurrent writers never see a partially written PDF.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(output_path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp creates the file private; give the PDF the usual permissions
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), 0o666 & ~_UMASK)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _generate_one(job: Tuple[Dict, Dict, Dict, str], backend: str = "reportlab") -> bool:
+    """Build one PDF in a worker process; see PDFGenerator.create_pdfs_parallel"""
+    return get_generator(backend=backend).create_pdf(*job)
+
+
+def _esc(text: str) -> str:
+    """Escape text from the documents for use inside Paragraph markup"""
+    return text.translate(_XML_ESCAPE)
+
+
+def _cp1252(text: str) -> str:
+    """Replace characters the fpdf2 core fonts cannot encode"""
+    return text.encode("cp1252", "replace").decode("cp1252")
+
 class PDFGenerator:
-    def __init__(self, page_size=letter, margin=0.5):
+    # "fpdf2" draws Part I with fpdf2 and keeps reportlab for the Part II
+    # rich text; the two parts are then merged with PyMuPDF
+    BACKENDS = ("reportlab", "fpdf2")
+
+    __slots__ = ("backend", "page_size", "margin", "green_color", "black_color",
+                 "styles", "_part_i_col_widths", "_part_i_label_width",
+                 "_part_i_value_width", "_frozen")
+
+    def __init__(self, page_size=letter, margin=0.5, backend="reportlab"):
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet
+
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown PDF backend {backend!r}, expected one of {self.BACKENDS}")
+        self.backend = backend
         self.page_size = page_size
         self.margin = margin * inch
         self.green_color = colors.HexColor("#008000")
@@ -18,7 +94,25 @@ class PDFGenerator:
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
 
+        # Part I layout is fixed, so the column widths and the text width
+        # available inside the label/value cells are worked out once
+        self._part_i_col_widths = (0.5 * inch, 2.5 * inch, 3.5 * inch)
+        self._part_i_label_width = self._part_i_col_widths[1] - 2 * PART_I_CELL_PADDING
+        self._part_i_value_width = self._part_i_col_widths[2] - 2 * PART_I_CELL_PADDING
+
+        # Instances may be shared across threads (see get_generator), so
+        # nothing is changed after this point. Flowables carry per-layout
+        # state (size, split and postponed flags), so they are never kept
+        # here; every build creates its own and only reads the state above
+        self._frozen = True
+
     def _setup_custom_styles(self):
+        if getattr(self, "_frozen", False):
+            raise RuntimeError("PDFGenerator styles cannot change after construction")
+
+        from reportlab.lib.enums import TA_LEFT
+        from reportlab.lib.styles import ParagraphStyle
+
         self.styles.add(ParagraphStyle(
             name="StrikeThrough",
             parent=self.styles["Normal"],
@@ -46,39 +140,7 @@ class PDFGenerator:
     def create_pdf(self, template_data: Dict, field_values: Dict,
                    amendments: Dict, output_path: str) -> bool:
         try:
-            doc = SimpleDocTemplate(output_path,
-                                    pagesize=letter,
-                                    leftMargin=self.margin,
-                                    rightMargin=self.margin,
-                                    topMargin=self.margin,
-                                    bottomMargin=self.margin,
-                                    title="Charter Party - Final Filled")
-
-            story = []
-
-            # Title
-            story.append(Paragraph(
-                "<b>CHARTER PARTY – FILLED TEMPLATE (Final Version)</b>",
-                self.styles["Heading1"]
-            ))
-            story.append(Spacer(1, 0.2 * inch))
-
-            # Build Part I
-            part_i_story = self._build_part_i(template_data, field_values)
-            if part_i_story:
-                story.extend(part_i_story)
-            else:
-                logger.warning("[PDF] _build_part_i returned empty story list")
-            story.append(PageBreak())
-
-            # Build Part II
-            part_ii_story = self._build_part_ii(template_data, amendments)
-            if part_ii_story:
-                story.extend(part_ii_story)
-            else:
-                logger.warning("[PDF] _build_part_ii returned empty story list")
-
-            doc.build(story)
+            _write_atomic(output_path, self._render([(template_data, field_values, amendments)]))
             logger.info(f"PDF created successfully: {output_path}")
             return True
 
@@ -86,114 +148,318 @@ class PDFGenerator:
             logger.error(f"Error creating PDF: {e}")
             return False
 
-    def _build_part_i(self, template_data: Dict, field_values: Dict) -> List:
+    def create_combined_pdf(self, jobs: List[Tuple[Dict, Dict, Dict]],
+                            output_path: str) -> bool:
+        """Write several charter parties into one PDF with a single build.
+
+        Each job is a ``(template_data, field_values, amendments)`` tuple as
+        taken by create_pdf; every job starts on a new page. Building once
+        lays out and writes the whole file in one pass instead of setting up
+        a document per charter party.
+        """
+        try:
+            if not jobs:
+                logger.warning("[PDF] create_combined_pdf called without jobs")
+                return False
+
+            _write_atomic(output_path, self._render(jobs))
+            logger.info(f"Combined PDF created successfully: {output_path} ({len(jobs)} documents)")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error creating combined PDF: {e}")
+            return False
+
+    def _render(self, jobs: List[Tuple[Dict, Dict, Dict]]) -> bytes:
+        """Bytes of a PDF holding each job, every job starting on a new page"""
+        from reportlab.platypus import PageBreak
+
+        if self.backend == "fpdf2":
+            return self._render_fpdf2(jobs)
+
         story = []
-        story.append(Paragraph(
+        for n, (template_data, field_values, amendments) in enumerate(jobs):
+            if n:
+                story.append(PageBreak())
+            story.extend(self._iter_story(template_data, field_values, amendments))
+        return self._build_bytes(story)
+
+    def _render_fpdf2(self, jobs: List[Tuple[Dict, Dict, Dict]]) -> bytes:
+        import fitz
+
+        merged = fitz.open()
+        for template_data, field_values, amendments in jobs:
+            part_i = self._build_part_i_fpdf2(template_data, field_values)
+            part_ii = list(self._iter_part_ii(template_data, amendments))
+            for data in (part_i, self._build_bytes(part_ii)):
+                with fitz.open(stream=data, filetype="pdf") as part:
+                    merged.insert_pdf(part)
+        merged.set_metadata({"title": "Charter Party - Final Filled"})
+        return merged.tobytes(deflate=True)
+
+    def _build_bytes(self, story: List) -> bytes:
+        """Lay out the story in memory and return the finished PDF"""
+        from reportlab.platypus import SimpleDocTemplate
+
+        buf = io.BytesIO()
+        doc = SimpleDocTemplate(buf,
+                                pagesize=letter,
+                                leftMargin=self.margin,
+                                rightMargin=self.margin,
+                                topMargin=self.margin,
+                                bottomMargin=self.margin,
+                                title="Charter Party - Final Filled")
+        doc.build(story)
+        return buf.getvalue()
+
+    def _iter_story(self, template_data: Dict, field_values: Dict,
+                    amendments: Dict) -> Iterator:
+        """Title, Part I and Part II of one charter party"""
+        from reportlab.platypus import PageBreak, Paragraph, Spacer
+
+        return chain(
+            (Paragraph("<b>CHARTER PARTY – FILLED TEMPLATE (Final Version)</b>",
+                       self.styles["Heading1"]),
+             Spacer(1, 0.2 * inch)),
+            self._iter_part_i(template_data, field_values),
+            (PageBreak(),),
+            self._iter_part_ii(template_data, amendments),
+        )
+
+    @classmethod
+    def create_pdfs_parallel(cls, jobs: List[Tuple[Dict, Dict, Dict, str]],
+                             max_workers: Optional[int] = None,
+                             backend: str = "reportlab") -> List[bool]:
+        """Create many PDFs at once, one worker process per CPU by default.
+
+        Each job is a ``(template_data, field_values, amendments, output_path)``
+        tuple as taken by create_pdf. Building a document is pure-Python CPU
+        work, so processes scale where threads would serialize on the GIL.
+        Returns the success flag of each job, in order.
+
+        Callers are often multi-threaded servers, so workers are started with
+        forkserver (or spawn) rather than forked while other threads may hold
+        locks.
+        """
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context(method)) as executor:
+            return list(executor.map(partial(_generate_one, backend=backend), jobs))
+
+    def _part_i_rows(self, template_data: Dict, field_values: Dict) -> List[Tuple[int, str, str]]:
+        """(field number, label, value) of every Part I field that has a label"""
+        fv = field_values
+        ti = template_data.get("part_i") or _EMPTY
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        def row(field_num: int) -> Optional[Tuple[str, str]]:
+            ev = fv.get(field_num) or _EMPTY
+            tv = ti.get(field_num) or _EMPTY
+            label = (ev.get("label") or "").strip() or (tv.get("label") or "").strip()
+            value = (ev.get("value") or "").strip()
+
+            if debug:
+                logger.debug(f"[PDF] Part I Field {field_num}: Label='{label}', Value='{value}'")
+
+            if not label:
+                logger.warning(f"[PDF] Skipped Part I Field {field_num} due to missing label.")
+                return None
+            return label, value or "_____"
+
+        rows = [(field_num, *r) for field_num in range(1, 20) if (r := row(field_num))]
+        if not rows:
+            logger.warning("[PDF] No Part I data to render")
+        return rows
+
+    def _iter_part_i(self, template_data: Dict, field_values: Dict) -> Iterator:
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from reportlab.platypus import Paragraph, Spacer
+
+        from .pdf_flowables import PartIGrid
+
+        yield Paragraph(
             "<b>Part I – Commercial Terms (Filled Values)</b>",
             self.styles["Heading2"]
-        ))
-        story.append(Spacer(1, 0.1 * inch))
+        )
+        yield Spacer(1, 0.1 * inch)
 
-        table_data = []
+        if not field_values and not template_data.get("part_i"):
+            yield Paragraph("<i>No commercial terms provided.</i>", self.styles["PartIField"])
+            return
 
-        for field_num in range(1, 20):
-            label = field_values.get(field_num, {}).get("label", "").strip() or \
-                template_data.get("part_i", {}).get(field_num, {}).get("label", "").strip()
-            value = field_values.get(field_num, {}).get("value", "").strip()
-
-            logger.debug(f"[PDF] Part I Field {field_num}: Label='{label}', Value='{value}'")
-            print(f"[PDF] Part I Field {field_num}: Label='{label}', Value='{value}'")
-
-            if label:
-                display_value = value if value else "_____"
-                table_data.append([
-                    Paragraph(f"<b>{field_num}.</b>", self.styles["PartIField"]),
-                    Paragraph(f"<b>{label}</b>", self.styles["PartIField"]),
-                    Paragraph(display_value, self.styles["PartIField"]),
-                ])
-            else:
-                logger.warning(f"[PDF] Skipped Part I Field {field_num} due to missing label.")
+        label_width = self._part_i_label_width
+        value_width = self._part_i_value_width
+        part_i_style = self.styles["PartIField"]
+
+        table_data = []
+        for field_num, label, value in self._part_i_rows(template_data, field_values):
+            # Plain strings are drawn on the canvas directly; only text
+            # too wide for its column needs a Paragraph to wrap it
+            if stringWidth(label, "Helvetica-Bold", PART_I_FONT_SIZE) > label_width:
+                label = Paragraph(_BOLD_FMT(_esc(label)), part_i_style)
+            if stringWidth(value, "Helvetica", PART_I_FONT_SIZE) > value_width:
+                value = Paragraph(_esc(value), part_i_style)
+            table_data.append([f"{field_num}.", label, value])
 
         if table_data:
-            t = Table(table_data, colWidths=[0.5 * inch, 2.5 * inch, 3.5 * inch])
-            t.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#CCCCCC")),
-            ]))
-            story.append(t)
-        else:
-            logger.warning("[PDF] No Part I data to render")
-            print("[PDF] No Part I data to render")
+            yield PartIGrid(table_data, self._part_i_col_widths)
 
-        return story
+    def _build_part_i_fpdf2(self, template_data: Dict, field_values: Dict) -> bytes:
+        """Title and Part I as a standalone PDF drawn with fpdf2"""
+        try:
+            from fpdf import FPDF
+        except ImportError as e:
+            raise ImportError("The fpdf2 backend requires: pip install fpdf2") from e
 
-    def _build_part_ii(self, template_data: Dict, amendments: Dict) -> List:
-        story = []
-        story.append(Paragraph(
+        pdf = FPDF(unit="pt", format=letter)
+        pdf.core_fonts_encoding = "windows-1252"
+        pdf.set_margins(self.margin, self.margin, self.margin)
+        pdf.set_auto_page_break(False)
+        pdf.add_page()
+
+        pdf.set_font("Helvetica", "B", 18)
+        pdf.multi_cell(0, 22, _cp1252("CHARTER PARTY – FILLED TEMPLATE (Final Version)"), align="L")
+        pdf.ln(0.2 * inch)
+        pdf.set_font("Helvetica", "B", 14)
+        pdf.multi_cell(0, 18, _cp1252("Part I – Commercial Terms (Filled Values)"), align="L")
+        pdf.ln(0.1 * inch + 6)
+
+        if not field_values and not template_data.get("part_i"):
+            pdf.set_font("Helvetica", "I", PART_I_FONT_SIZE)
+            pdf.cell(0, PART_I_FONT_SIZE * 1.2, "No commercial terms provided.")
+            return bytes(pdf.output())
+
+        col_widths = self._part_i_col_widths
+        line_height = PART_I_FONT_SIZE * 1.2
+        bottom = pdf.h - self.margin
+        left = self.margin + (pdf.epw - sum(col_widths)) / 2
+        pdf.c_margin = PART_I_CELL_PADDING
+        pdf.set_draw_color(204, 204, 204)
+        pdf.set_line_width(0.5)
+
+        for field_num, label, value in self._part_i_rows(template_data, field_values):
+            cells = [(f"{field_num}.", "B"), (_cp1252(label), "B"), (_cp1252(value), "")]
+            lines = 1
+            for (text, style), width in zip(cells, col_widths):
+                pdf.set_font("Helvetica", style, PART_I_FONT_SIZE)
+                lines = max(lines, len(pdf.multi_cell(width, line_height, text, align="L",
+                                                      dry_run=True, output="LINES")))
+            row_height = lines * line_height + 2 * PART_I_ROW_PADDING
+            if row_height > bottom - self.margin:
+                # Rows are not split, and reportlab fails on such a cell too
+                raise ValueError(f"Part I field {field_num} is too tall for one page "
+                                 f"({row_height:.0f}pt > {bottom - self.margin:.0f}pt)")
+            if pdf.y + row_height > bottom:
+                pdf.add_page()
+
+            x, y = left, pdf.y
+            for (text, style), width in zip(cells, col_widths):
+                pdf.rect(x, y, width, row_height)
+                pdf.set_font("Helvetica", style, PART_I_FONT_SIZE)
+                pdf.set_xy(x, y + PART_I_ROW_PADDING)
+                pdf.multi_cell(width, line_height, text, align="L")
+                x += width
+            pdf.set_y(y + row_height)
+
+        return bytes(pdf.output())
+
+    def _iter_part_ii(self, template_data: Dict, amendments: Dict) -> Iterator:
+        from reportlab.platypus import Paragraph, Spacer
+
+        yield Paragraph(
             "<b>Part II – Finalized Clauses (Amendments Incorporated)</b>",
             self.styles["Heading2"]
-        ))
-        story.append(Spacer(1, 0.1 * inch))
+        )
+        yield Spacer(1, 0.1 * inch)
 
+        part_i_style = self.styles["PartIField"]
+        h3 = self.styles["Heading3"]
+        strike_style = self.styles["StrikeThrough"]
+        added_style = self.styles["AddedText"]
         clauses = template_data.get("part_ii", [])
-        logger.debug(f"[PDF] Number of clauses in template: {len(clauses)}")
-        print(f"[PDF] Number of clauses in template: {len(clauses)}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"[PDF] Number of clauses in template: {len(clauses)}")
 
         for idx, clause in enumerate(clauses):
             title = clause.get('title', '')
-            logger.debug(f"[PDF] Clause {idx + 1}: Title='{title}'")
-            print(f"[PDF] Clause {idx + 1}: Title='{title}'")
-            story.append(Paragraph(f"<b>{title}</b>", self.styles["Heading3"]))
+            if debug:
+                logger.debug(f"[PDF] Clause {idx + 1}: Title='{title}'")
+            yield Paragraph(_BOLD_FMT(_esc(title)), h3)
 
             content = clause.get("content", [])
-            logger.debug(f"[PDF] Clause {idx + 1} content lines: {len(content)}")
-            print(f"[PDF] Clause {idx + 1} content lines: {len(content)}")
+            if debug:
+                logger.debug(f"[PDF] Clause {idx + 1} content lines: {len(content)}")
 
+            has_content = False
             for i, item in enumerate(content):
                 line_num = item.get("line", "")
                 text = item.get("text", "").strip()
-                logger.debug(f"[PDF] Clause {idx + 1}, line {i + 1}: line_num={line_num}, text='{text[:100]}'")
-                print(f"[PDF] Clause {idx + 1}, line {i + 1}: line_num={line_num}, text='{text[:100]}'")
+                if not text and not line_num:
+                    continue
+                if debug:
+                    logger.debug(f"[PDF] Clause {idx + 1}, line {i + 1}: line_num={line_num}, text='{text[:100]}'")
 
                 if line_num:
-                    formatted_text = f"<b>{line_num:2d}</b>&nbsp;&nbsp;{text}"
-                    story.append(Paragraph(formatted_text, self.styles["PartIField"]))
+                    yield Paragraph(_LINE_FMT(line_num, _esc(text)), part_i_style)
                 else:
-                    story.append(Paragraph(text, self.styles["PartIField"]))
-
-            story.append(Spacer(1, 0.05 * inch))
-
-        if amendments.get("deleted"):
-            story.append(Paragraph("<b>Deleted Content:</b>", self.styles["Heading3"]))
-            for item in amendments["deleted"]:
-                logger.debug(f"[PDF] Deleted amendment: {item.get('text','')}")
-                print(f"[PDF] Deleted amendment: {item.get('text','')}")
-                deleted_text = f"~~{item['text']}~~"
-                story.append(Paragraph(deleted_text, self.styles["StrikeThrough"]))
-
-        if amendments.get("added"):
-            story.append(Spacer(1, 0.05 * inch))
-            story.append(Paragraph("<b>Added Content:</b>", self.styles["Heading3"]))
-            for item in amendments["added"]:
-                logger.debug(f"[PDF] Added amendment: {item.get('text','')}")
-                print(f"[PDF] Added amendment: {item.get('text','')}")
-                story.append(Paragraph(item["text"], self.styles["AddedText"]))
-
-        if amendments.get("new"):
-            story.append(Spacer(1, 0.05 * inch))
-            story.append(Paragraph("<b>New Lines:</b>", self.styles["Heading3"]))
-            logger.debug(f"[PDF] Appending {len(amendments['new'])} new lines")
-            print(f"[PDF] Appending {len(amendments['new'])} new lines")
-            for item in amendments["new"]:
+                    yield Paragraph(_esc(text), part_i_style)
+                has_content = True
+
+            if has_content:
+                yield Spacer(1, 0.05 * inch)
+
+        # Blank amendment lines would only add empty paragraphs, and a
+        # heading with nothing under it
+        deleted, modified, added, new = (
+            [item for item in amendments.get(kind) or [] if item.get("text", "").strip()]
+            for kind in ("deleted", "modified", "added", "new")
+        )
+
+        if deleted:
+            yield Paragraph("<b>Deleted Content:</b>", h3)
+            for item in deleted:
+                if debug:
+                    logger.debug(f"[PDF] Deleted amendment: {item.get('text','')}")
+                yield Paragraph(_DEL_FMT(_esc(item["text"])), strike_style)
+
+        if modified:
+            yield Spacer(1, 0.05 * inch)
+            yield Paragraph("<b>Modified Content:</b>", h3)
+            for item in modified:
+                if debug:
+                    logger.debug(f"[PDF] Modified amendment: {item.get('original_text','')} -> {item['text']}")
+                # The template wording struck through, then its replacement
+                yield Paragraph(_DEL_FMT(_esc(item.get("original_text", ""))), strike_style)
+                yield Paragraph(_esc(item["text"]), added_style)
+
+        if added:
+            yield Spacer(1, 0.05 * inch)
+            yield Paragraph("<b>Added Content:</b>", h3)
+            for item in added:
+                if debug:
+                    logger.debug(f"[PDF] Added amendment: {item.get('text','')}")
+                yield Paragraph(_esc(item["text"]), added_style)
+
+        if new:
+            yield Spacer(1, 0.05 * inch)
+            yield Paragraph("<b>New Lines:</b>", h3)
+            if debug:
+                logger.debug(f"[PDF] Appending {len(new)} new lines")
+            for item in new:
                 text = item.get("text", "")
-                logger.debug(f"[PDF] New line amendment: {text}")
-                print(f"[PDF] New line amendment: {text}")
-                story.append(Paragraph(text, self.styles["AddedText"]))
+                if debug:
+                    logger.debug(f"[PDF] New line amendment: {text}")
+                yield Paragraph(_esc(text), added_style)
+
+
+@lru_cache(maxsize=8)
+def get_generator(page_size=letter, margin=0.5, backend="reportlab") -> PDFGenerator:
+    """Shared PDFGenerator for the given settings, built once per process.
 
-        return story
+    Setting up the style sheet is the same work for every document, so
+    request handlers and workers reuse one instance instead of constructing
+    a generator per PDF. The generator holds no flowables between builds,
+    so concurrent create_pdf calls from several threads are safe.
+    """
+    return PDFGenerator(page_size, margin, backend)
@@ -0,0 +1,5 @@
+# Part I grid metrics shared by PDFGenerator and the Part I flowable. Kept
+# free of reportlab imports so the generator can load it eagerly.
+PART_I_CELL_PADDING = 6
+PART_I_ROW_PADDING = 4
+PART_I_FONT_SIZE = 10